@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+
+"""
+Measures how many recipes per second Produce can launch.
+
+The Producefile has RECIPES independent tasks whose recipes do nothing but
+run a no-op command, padded with a comment to RECIPE_SIZE bytes, so the time
+is dominated by Produce's per-recipe overhead. Produce is run with as many
+jobs as there are CPU cores unless --jobs is given. Recipes larger than
+produce.RECIPE_PIPE_MAX bytes take the slower path through a temporary file,
+so the two paths can be compared with --recipe-size. Prints a JSON object
+with the number of recipes, the number of jobs, the wall-clock time and the
+number of recipes per second.
+"""
+
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+PRODUCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                       'produce')
+
+
+def write_producefile(path, recipes, recipe_size):
+    padding = 'x' * max(0, recipe_size - len('true # \n'))
+    with open(path, 'w') as f:
+        f.write('[]\ndefault = all\n\n')
+        f.write('[all]\n')
+        f.write('type = task\n')
+        f.write(f"deps = %{{'t' + str(i) for i in range({recipes})}}\n\n")
+        f.write('[t%{i}]\n')
+        f.write('type = task\n')
+        f.write(f'recipe = true # {padding}\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--recipes', type=int, default=2000)
+    parser.add_argument('--recipe-size', type=int, default=64)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        producefile = os.path.join(tmp, 'produce.ini')
+        write_producefile(producefile, args.recipes, args.recipe_size)
+        start = time.time()
+        subprocess.run(
+            [sys.executable, PRODUCE, '-f', producefile, '-j',
+             str(args.jobs)],
+            cwd=tmp, stderr=subprocess.DEVNULL, check=True)
+        seconds = time.time() - start
+    json.dump({
+        'recipes': args.recipes,
+        'jobs': args.jobs,
+        'seconds': round(seconds, 3),
+        'recipes_per_second': round(args.recipes / seconds, 1),
+    }, sys.stdout)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+
+"""
+Measures the peak memory use of Produce on a synthetic dependency graph.
+
+The graph is a tree of tasks in which every inner node depends on BRANCHING
+children; by default it has over a million nodes. Every task has a recipe of
+roughly RECIPE_SIZE bytes that mentions its target, so recipes cannot be
+shared between targets. Produce is run in dry-run mode, so recipes are
+expanded but not executed. Prints a JSON object with the number of nodes, the
+wall-clock time and the peak resident set size of the Produce process.
+"""
+
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+PRODUCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                       'produce')
+
+
+def write_producefile(path, levels, branching, recipe_size):
+    filler = 'x' * recipe_size
+    with open(path, 'w') as f:
+        f.write(f'[]\ndefault = n\n\n')
+        f.write('[n%{path}]\n')
+        f.write('type = task\n')
+        f.write(f"cond = %{{path.count('.') < {levels}}}\n")
+        f.write(f"deps = %{{target + '.' + str(i) "
+                f"for i in range({branching})}}\n")
+        f.write(f'recipe = echo %{{target}} # {filler}\n\n')
+        f.write('[n%{path}]\n')
+        f.write('type = task\n')
+        f.write(f'recipe = echo %{{target}} # {filler}\n')
+
+
+def count_nodes(levels, branching):
+    return sum(branching ** level for level in range(levels + 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--levels', type=int, default=3)
+    parser.add_argument('--branching', type=int, default=100)
+    parser.add_argument('--recipe-size', type=int, default=2048)
+    parser.add_argument('--jobs', type=int, default=1)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        producefile = os.path.join(tmp, 'produce.ini')
+        write_producefile(producefile, args.levels, args.branching,
+                          args.recipe_size)
+        start = time.time()
+        subprocess.run(
+            [sys.executable, PRODUCE, '-n', '-f', producefile, '-j',
+             str(args.jobs)],
+            cwd=tmp, stderr=subprocess.DEVNULL, check=True)
+        seconds = time.time() - start
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    json.dump({
+        'nodes': count_nodes(args.levels, args.branching),
+        'seconds': round(seconds, 3),
+        # ru_maxrss is in kilobytes on Linux, in bytes on macOS:
+        'max_rss_kb': usage.ru_maxrss if sys.platform != 'darwin'
+                      else usage.ru_maxrss // 1024,
+    }, sys.stdout)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+
+"""
+Runs Produce on synthetic dependency graphs and records how long it takes.
+
+Each graph is generated as a Producefile whose targets are files created by
+no-op recipes, so the numbers reflect Produce's own overhead. The graphs are:
+
+  fan_in       one target depending on SIZE independent files
+  chain        a chain of SIZE files, each depending on the next
+  diamonds     a lattice of SIZE files in ten layers, each file depending on
+               two files of the next layer, so dependencies are shared
+  multi_output SIZE files made by SIZE / 2 recipes with two outputs each
+  many_rules   SIZE files matched by SIZE different rules, most of which
+               have to be tried for each target
+
+For each graph, the following are measured: the time to parse the Producefile
+(parse_seconds), the time to plan a full build with --plan (plan_seconds), the
+time of the full build (build_seconds), the build time per recipe
+(recipe_overhead_seconds), the time of a rebuild in which everything is up to
+date (noop_seconds), and the peak resident set size of any of these runs
+(max_rss_kb). The results are written as JSON together with the
+configuration. With --compare, they are compared to an earlier results file,
+and the exit status is 1 if any time got worse by more than the tolerance.
+"""
+
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+
+PRODUCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                       'produce')
+
+
+# Loads the Produce script as a module and times reading the Producefile:
+PARSE_SCRIPT = '''
+import importlib.machinery, importlib.util, sys, time
+loader = importlib.machinery.SourceFileLoader('produce', sys.argv[1])
+spec = importlib.util.spec_from_loader('produce', loader)
+produce = importlib.util.module_from_spec(spec)
+loader.exec_module(produce)
+start = time.time()
+produce.Session(sys.argv[2]).close()
+print(time.time() - start)
+'''
+
+
+RECIPE = 'recipe = : > %{target}\n'
+
+
+def write_fan_in(f, size):
+    f.write('[out/all.txt]\n')
+    f.write(f"deps = %{{'out/leaf' + str(i) + '.txt' for i in range({size})}}\n")
+    f.write(RECIPE + '\n')
+    f.write('[out/leaf%{i}.txt]\n')
+    f.write(RECIPE)
+    return size + 1
+
+
+def write_chain(f, size):
+    f.write('[out/all.txt]\n')
+    f.write('dep.first = out/chain0.txt\n')
+    f.write(RECIPE + '\n')
+    f.write('[out/chain%{i}.txt]\n')
+    f.write(f'cond = %{{int(i) < {size - 1}}}\n')
+    f.write("dep.next = out/chain%{int(i) + 1}.txt\n")
+    f.write(RECIPE + '\n')
+    f.write('[out/chain%{i}.txt]\n')
+    f.write(RECIPE)
+    return size + 1
+
+
+def write_diamonds(f, size):
+    layers = 10
+    width = max(1, size // layers)
+    f.write('[out/all.txt]\n')
+    f.write(f"deps = %{{'out/d0_' + str(j) + '.txt' for j in range({width})}}\n")
+    f.write(RECIPE + '\n')
+    f.write('[out/d%{l}_%{j}.txt]\n')
+    f.write(f'cond = %{{int(l) < {layers - 1}}}\n')
+    f.write("dep.left = out/d%{int(l) + 1}_%{j}.txt\n")
+    f.write(f"dep.right = out/d%{{int(l) + 1}}_%{{(int(j) + 1) % {width}}}"
+            ".txt\n")
+    f.write(RECIPE + '\n')
+    f.write('[out/d%{l}_%{j}.txt]\n')
+    f.write(RECIPE)
+    return layers * width + 1
+
+
+def write_multi_output(f, size):
+    pairs = max(1, size // 2)
+    f.write('[out/all.txt]\n')
+    f.write(f"deps = %{{'out/pair' + str(i) + '.b' for i in range({pairs})}}\n")
+    f.write(RECIPE + '\n')
+    f.write('[out/pair%{i}.a]\n')
+    f.write('out.b = out/pair%{i}.b\n')
+    f.write('recipe = : > %{target}; : > %{b}\n\n')
+    f.write('[out/pair%{i}.b]\n')
+    f.write('dep.a = out/pair%{i}.a\n')
+    return 2 * pairs + 1
+
+
+def write_many_rules(f, size):
+    f.write('[out/all.txt]\n')
+    f.write(f"deps = %{{'out/rule' + str(i) + '.txt' for i in range({size})}}\n")
+    f.write(RECIPE + '\n')
+    for i in range(size):
+        f.write(f'[out/rule{i}.txt]\n')
+        f.write(RECIPE + '\n')
+    return size + 1
+
+
+GRAPHS = {
+    'fan_in': write_fan_in,
+    'chain': write_chain,
+    'diamonds': write_diamonds,
+    'multi_output': write_multi_output,
+    'many_rules': write_many_rules,
+}
+
+
+def run(args, cwd):
+    """Runs a command, returns its wall-clock time and peak RSS in KB."""
+    start = time.time()
+    proc = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL)
+    output = proc.stdout.read()
+    proc.stdout.close()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    seconds = time.time() - start
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, args)
+    # ru_maxrss is in kilobytes on Linux, in bytes on macOS:
+    max_rss_kb = usage.ru_maxrss if sys.platform != 'darwin' \
+            else usage.ru_maxrss // 1024
+    return seconds, max_rss_kb, output
+
+
+def measure(name, size, jobs):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.mkdir(os.path.join(tmp, 'out'))
+        producefile = os.path.join(tmp, 'produce.ini')
+        with open(producefile, 'w') as f:
+            f.write('[]\ndefault = out/all.txt\n\n')
+            nodes = GRAPHS[name](f, size)
+        produce = [sys.executable, PRODUCE, '-j', str(jobs)]
+        _, parse_rss, output = run(
+            [sys.executable, '-c', PARSE_SCRIPT, PRODUCE, producefile], tmp)
+        parse_seconds = float(output)
+        plan_seconds, plan_rss, output = run(produce + ['--plan', 'json'],
+                                             tmp)
+        recipes = json.loads(output)['count']
+        build_seconds, build_rss, _ = run(produce, tmp)
+        noop_seconds, noop_rss, _ = run(produce, tmp)
+    return {
+        'nodes': nodes,
+        'recipes': recipes,
+        'parse_seconds': round(parse_seconds, 3),
+        'plan_seconds': round(plan_seconds, 3),
+        'build_seconds': round(build_seconds, 3),
+        'recipe_overhead_seconds': round(build_seconds / recipes, 6),
+        'noop_seconds': round(noop_seconds, 3),
+        'max_rss_kb': max(parse_rss, plan_rss, build_rss, noop_rss),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Returns descriptions of the times that got worse than tolerated."""
+    regressions = []
+    for name, result in results['graphs'].items():
+        old = baseline['graphs'].get(name)
+        if old is None or 'error' in result or 'error' in old \
+                or old['size'] != result['size']:
+            continue
+        for key, value in result.items():
+            if not key.endswith('_seconds') or key not in old:
+                continue
+            # Ignore differences too small to measure reliably:
+            if value > old[key] * (1 + tolerance) and value - old[key] > 0.05:
+                regressions.append(
+                    f'{name}: {key} went from {old[key]} to {value}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--graphs', nargs='+', choices=sorted(GRAPHS),
+                        default=list(GRAPHS))
+    parser.add_argument('--size', type=int, default=1000,
+                        help='approximate number of nodes in each graph')
+    parser.add_argument('--graph-size', metavar='NAME=SIZE', action='append',
+                        default=[], help='size for one graph')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count())
+    parser.add_argument('--output', help='write results here, not stdout')
+    parser.add_argument('--compare', metavar='RESULTS',
+                        help='earlier results to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='tolerated relative slowdown (default: 0.2)')
+    args = parser.parse_args()
+    sizes = {name: args.size for name in args.graphs}
+    for setting in args.graph_size:
+        name, _, size = setting.partition('=')
+        sizes[name] = int(size)
+    results = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'jobs': args.jobs,
+        'graphs': {},
+    }
+    for name in args.graphs:
+        try:
+            results['graphs'][name] = measure(name, sizes[name], args.jobs)
+        except subprocess.CalledProcessError as e:
+            results['graphs'][name] = {'error': str(e)}
+        results['graphs'][name]['size'] = sizes[name]
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import os
+import prodtest
+import produce
+import resource
+
+class CaptureTest(prodtest.ProduceTestCase):
+
+    """
+    Tests capturing the output of recipes with --capture, --show-output and
+    --log-dir.
+    """
+
+    def outputs(self, logs):
+        return {r.msg.target: (r.msg.action, r.msg.output)
+                for r in logs.records if r.msg.output is not None}
+
+    def test_success(self):
+        with self.assertLogs('produce') as logs:
+            self.produce('a', **{'--capture': None})
+        self.assertState(('a', 'b'), ())
+        self.assertEqual(self.outputs(logs), {})
+
+    def test_show_output(self):
+        with self.assertLogs('produce') as logs:
+            self.produce('a', **{'--show-output': None})
+        self.assertEqual(self.outputs(logs), {
+            'a': ('complete', 'building a\n'),
+            'b': ('complete', 'building b\nwarning about b\n'),
+        })
+
+    def test_failure(self):
+        with self.assertLogs('produce') as logs:
+            with self.assertRaises(produce.ProduceError):
+                self.produce('fail', **{'--capture': None})
+        action, output = self.outputs(logs)['fail']
+        self.assertEqual(action, 'incomplete')
+        lines = output.splitlines()
+        self.assertEqual(lines[0], '[earlier output not shown]')
+        self.assertEqual(lines[1:], [str(i) for i in range(81, 101)])
+
+    def test_log_dir(self):
+        with self.assertLogs('produce') as logs:
+            with self.assertRaises(produce.ProduceError):
+                self.produce('fail', **{'--log-dir': 'logs'})
+        output = self.outputs(logs)['fail'][1]
+        self.assertEqual(output.splitlines()[0],
+                         '[earlier output in logs/fail.log]')
+        self.assertFileContents('logs/fail.log',
+                                ''.join(f'{i}\n' for i in range(1, 101)))
+        self.produce('a', **{'--log-dir': 'logs'})
+        self.assertFileContents('logs/b.log', 'building b\nwarning about b\n')
+
+    def test_forkserver(self):
+        with self.assertLogs('produce') as logs:
+            with self.assertRaises(produce.ProduceError):
+                self.produce('py', **{'--capture': None})
+        self.assertEqual(self.outputs(logs)['py'],
+                         ('incomplete', 'python output'))
+
+    def test_closed_output(self):
+        # Once the recipe closes its output, waiting must not busy-loop:
+        before = resource.getrusage(resource.RUSAGE_SELF)
+        with self.assertLogs('produce') as logs:
+            self.produce('closed', **{'--show-output': None})
+        after = resource.getrusage(resource.RUSAGE_SELF)
+        cpu = after.ru_utime + after.ru_stime \
+                - before.ru_utime - before.ru_stime
+        self.assertLess(cpu, 0.5)
+        self.assertEqual(self.outputs(logs),
+                         {'closed': ('complete', 'before\n')})
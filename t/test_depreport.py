@@ -0,0 +1,56 @@
+import os
+import prodtest
+import produce
+
+class DepreportTest(prodtest.ProduceTestCase):
+
+    """
+    Tests dependencies reported by recipes via the depreport attribute.
+    """
+
+    def test_depreport(self):
+        files = ['produce.ini', 'main.in', 'header.h', 'other header.h']
+        self.assertDirectoryContents(files)
+        with self.assertLogs(logger='produce', level='INFO') as l:
+            self.produce('main.out')
+        self.assertEqual(len(l.output), 2)
+        # The report has been folded into the deps log:
+        self.assertDirectoryContents(files + ['main.out', '.produce'])
+        self.assertDirectoryContents(['deps', 'durations'], '.produce')
+        self.assertEqual(produce.DepsLog('.produce/deps').get('main.out'),
+                         ['main.in', 'header.h'])
+        # Reported dependencies are used in later up-to-date checks:
+        self.assertUpdates([], lambda: self.produce('main.out'), [],
+                           ['main.out'])
+        self.assertUpdates(['header.h'], lambda: self.produce('main.out'),
+                           ['main.out'], [])
+        self.assertUpdates(['other header.h'],
+                           lambda: self.produce('main.out'), [], ['main.out'])
+        # The report changes with the recipe's inputs:
+        self.createFile('main.in', 'other\n')
+        self.assertUpdates([], lambda: self.produce('main.out'),
+                           ['main.out'], [])
+        self.assertEqual(produce.DepsLog('.produce/deps').get('main.out'),
+                         ['main.in', 'other header.h'])
+        self.assertUpdates(['header.h'], lambda: self.produce('main.out'), [],
+                           ['main.out'])
+        self.assertUpdates(['other header.h'],
+                           lambda: self.produce('main.out'), ['main.out'], [])
+
+    def test_missing_log(self):
+        self.produce('main.out')
+        os.remove('.produce/deps')
+        self.assertUpdates([], lambda: self.produce('main.out'), ['main.out'],
+                           [])
+
+    def test_compaction(self):
+        log = produce.DepsLog('.produce/deps')
+        for i in range(300):
+            log.record('a', ['b', str(i % 7)])
+        log.close()
+        size = os.path.getsize('.produce/deps')
+        log = produce.DepsLog('.produce/deps')
+        self.assertEqual(log.get('a'), ['b', '5'])
+        self.assertLess(os.path.getsize('.produce/deps'), size)
+        self.assertEqual(produce.DepsLog('.produce/deps').get('a'),
+                         ['b', '5'])
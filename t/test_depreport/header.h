@@ -0,0 +1 @@
+header
@@ -0,0 +1 @@
+other header
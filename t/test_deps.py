@@ -31,6 +31,9 @@ class DepTest(ProduceTestCase):
         self.assertNewer('d', 'c') # c was not rebuilt
         self.sleep()
         self.touch('c')
+        # Without this, a can be rebuilt within the same (coarse) file
+        # timestamp tick as c was touched in:
+        self.sleep()
         self.produce('a')
         self.assertNewer('a', 'c') # a was rebuilt
         self.assertNewer('c', 'b') # b was not rebuilt
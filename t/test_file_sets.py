@@ -0,0 +1,84 @@
+import glob
+import prodtest
+import produce
+import shlex
+
+class FileSetsTest(prodtest.ProduceTestCase):
+
+    """
+    Tests the built-in functions find_files and map_paths.
+    """
+
+    def test_all_models(self):
+        self.produce('all_models')
+        self.assertDirectoryContents(['input001.model', 'input002.model',
+                                      'sub'], 'models')
+        self.assertDirectoryContents(['input003.model'], 'models/sub')
+
+    def test_globals_in_map_paths(self):
+        self.produce('flat_models')
+        self.assertDirectoryContents(['input003.model'], 'flat')
+        session = produce.Session()
+        self.assertEqual(session.globes['map_paths'](
+                ['a.txt'], '%{x}.txt', '%{x}.%{suffix}'), ['a.model'])
+
+    def test_find_files(self):
+        find_files = produce.FileSets().find_files
+        self.assertEqual(find_files('inputs/*.txt'),
+                         ['inputs/input001.txt', 'inputs/input002.txt'])
+        self.assertEqual(find_files('inputs/.*'), ['inputs/.hidden.txt'])
+        self.assertEqual(find_files('inputs/**/*.txt'),
+                         ['inputs/input001.txt', 'inputs/input002.txt',
+                          'inputs/sub/input003.txt'])
+        self.assertEqual(find_files('**/*.md', 'inputs/sub/*'),
+                         ['inputs/notes.md', 'inputs/sub/input003.txt'])
+        self.assertEqual(find_files('inputs/**'),
+                         ['inputs/input001.txt', 'inputs/input002.txt',
+                          'inputs/notes.md', 'inputs/sub',
+                          'inputs/sub/input003.txt'])
+        self.assertEqual(find_files('inputs/sub/'), ['inputs/sub/'])
+        self.assertEqual(find_files('inputs/input001.txt'),
+                         ['inputs/input001.txt'])
+        self.assertEqual(find_files('nonexistent/*', 'inputs/input0?.txt'),
+                         [])
+
+    def test_dot_components(self):
+        find_files = produce.FileSets().find_files
+        self.assertEqual(find_files('./inputs/*.txt'),
+                         ['./inputs/input001.txt', './inputs/input002.txt'])
+        self.assertEqual(find_files('inputs/./*.txt'),
+                         ['inputs/./input001.txt', 'inputs/./input002.txt'])
+        self.assertEqual(find_files('inputs/sub/../*.md'),
+                         ['inputs/sub/../notes.md'])
+        self.assertEqual(find_files('../test_file_sets.working/inputs/*.txt'),
+                         ['../test_file_sets.working/inputs/input001.txt',
+                          '../test_file_sets.working/inputs/input002.txt'])
+        for pattern in ('./inputs/*.txt', 'inputs/./**/*.txt',
+                        '../test_file_sets.working/inputs/sub/*'):
+            self.assertEqual(find_files(pattern),
+                             sorted(glob.glob(pattern, recursive=True)))
+
+    def test_listings_are_cached(self):
+        file_sets = produce.FileSets()
+        self.assertEqual(len(file_sets.find_files('inputs/*.txt')), 2)
+        self.createFile('inputs/input004.txt', '')
+        self.assertEqual(len(file_sets.find_files('inputs/*.txt')), 2)
+        file_sets.invalidate()
+        self.assertEqual(len(file_sets.find_files('inputs/*.txt')), 3)
+
+    def test_map_paths(self):
+        map_paths = produce.FileSets().map_paths
+        paths = ['in/a.txt', 'in/b.txt', 'in/c.md', 'in/d%.txt']
+        self.assertEqual(map_paths(paths, 'in/%{x}.txt', 'out/%{x}.out'),
+                         ['out/a.out', 'out/b.out', 'out/d%.out'])
+        self.assertEqual(map_paths(paths, 'in/%{x}.txt', 'out/%{x.upper()}'),
+                         ['out/A', 'out/B', 'out/D%'])
+        self.assertEqual(map_paths(paths, 'in/%{x}.%{y}', '%{y}%%%{x}'),
+                         ['txt%a', 'txt%b', 'md%c', 'txt%d%'])
+        with self.assertRaisesRegex(produce.ProduceError, 'name error'):
+            map_paths(paths, 'in/%{x}.txt', '%{z}')
+
+    def test_split_list(self):
+        for value in ('', '  ', 'a', ' a  b\tc\n', "a 'b c' d", 'a\\ b',
+                      'a "b" c'):
+            self.assertEqual(produce.split_list(value), shlex.split(value))
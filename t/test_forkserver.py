@@ -0,0 +1,43 @@
+import prodtest
+import produce
+import time
+
+class ForkServerTest(prodtest.ProduceTestCase):
+
+    """
+    Tests running Python recipes in children of a forkserver.
+    """
+
+    def test_prelude_and_preload(self):
+        self.produce(**{'-j': '2'})
+        self.assertFileContents('a.txt', '["hello a", true]')
+        self.assertFileContents('b.txt', '["hello b", true]')
+
+    def test_included_prelude(self):
+        self.produce('shouted/a.txt', 'isolated.txt')
+        self.assertFileContents('shouted/a.txt', '"HELLO A!"')
+        self.assertFileContents('isolated.txt', 'false')
+
+    def test_failure(self):
+        with self.assertRaises(produce.ProduceError):
+            self.produce('fail.txt')
+        self.assertDirectoryContents(['produce.ini', 'shouted.ini', 'fail.txt~'])
+        with self.assertRaises(produce.ProduceError):
+            self.produce('exit.txt')
+
+    def test_kill(self):
+        start = time.time()
+        with self.assertRaises(produce.ProduceError):
+            self.produce('stop', **{'-j': '2'})
+        self.assertLess(time.time() - start, 3)
+        self.assertDirectoryContents(['produce.ini', 'shouted.ini', 'slow.txt~'])
+
+    def test_session(self):
+        with produce.Session() as session:
+            session.produce(['a.txt'])
+            server = session.forkserver.process
+            self.assertIsNotNone(server)
+            session.produce(['b.txt'])
+            self.assertIs(server, session.forkserver.process)
+        self.assertIsNotNone(server.returncode)
+        self.assertIsNone(session.forkserver.process)
@@ -0,0 +1,29 @@
+import prodtest
+import produce
+
+class IncludeTest(prodtest.ProduceTestCase):
+
+    """
+    Tests that included Producefiles are loaded only when needed.
+    """
+
+    def test_not_needed(self):
+        self.produce('other.txt')
+        self.assertFileContents('other.txt', 'hi\n')
+        self.assertFileDoesNotExist('prelude-ran')
+
+    def test_needed(self):
+        self.produce('data/a.txt', 'data/b.txt', 'other.txt', **{'-j': '2'})
+        self.assertFileContents('data/a.txt', 'hello a!\n')
+        self.assertFileContents('data/b.txt', 'hello b!\n')
+        self.assertFileContents('other.txt', 'hi\n')
+        self.assertFileContents('prelude-ran', 'data\n')
+
+    def test_fall_through(self):
+        self.produce('data/c.md')
+        self.assertFileContents('data/c.md', 'md\n')
+        self.assertFileContents('prelude-ran', 'data\n')
+
+    def test_cycle(self):
+        with self.assertRaisesRegex(produce.ProduceError, 'cyclic include'):
+            self.produce('loop/x')
@@ -0,0 +1,35 @@
+import prodtest
+import produce
+
+class LazyRecipeTest(prodtest.ProduceTestCase):
+
+    """
+    Tests that recipes are expanded only when they are run.
+    """
+
+    def test_up_to_date(self):
+        self.createFile('a.txt', '')
+        self.produce('a.txt')
+
+    def test_out_of_date(self):
+        with self.assertLogs('produce') as logs:
+            with self.assertRaisesRegex(produce.ProduceError, 'name error'):
+                self.produce('a.txt')
+        self.assertDirectoryContents(['produce.ini'])
+        self.assertEqual([('building file', 'a.txt'), ('incomplete', 'a.txt')],
+                         [(r.msg.action, r.msg.target) for r in logs.records
+                          if isinstance(r.msg, produce.StatusMessage)])
+
+    def test_referenced_recipe(self):
+        self.produce('b.txt')
+        self.assertFileContents('b.txt', 'b.txt\n')
+
+    def test_later_attribute(self):
+        """
+        The recipe only sees variables defined before it, even though it is
+        expanded later.
+        """
+        with self.assertRaisesRegex(produce.ProduceError, 'name error'):
+            self.produce('c.txt')
+        self.assertFileExists('b.txt')
+        self.assertFileDoesNotExist('c.txt')
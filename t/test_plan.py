@@ -0,0 +1,62 @@
+import contextlib
+import io
+import json
+import os
+import prodtest
+import produce
+
+class PlanTest(prodtest.ProduceTestCase):
+
+    """
+    Tests machine-readable plans of the recipes that would run.
+    """
+
+    def plan(self, *args):
+        stream = io.StringIO()
+        with contextlib.redirect_stdout(stream):
+            self.produce(*args)
+        return stream.getvalue()
+
+    def test_json(self):
+        plan = json.loads(self.plan('--plan', 'json', 'check'))
+        self.assertEqual(['mid.txt', 'other.txt', 'out.txt', 'check'],
+                         [entry['target'] for entry in plan['targets']])
+        self.assertEqual(4, plan['count'])
+        self.assertEqual(4, plan['unestimated'])
+        self.assertEqual(0, plan['estimated_seconds'])
+        check = plan['targets'][-1]
+        self.assertEqual('it is a task', check['reason'])
+        self.assertEqual('produce.ini:16', check['rule'])
+        self.assertEqual(2, check['jobs'])
+        self.assertIsNone(check['estimate'])
+        # Planning does not run anything:
+        self.assertDirectoryContents(['produce.ini', 'src.txt'])
+
+    def test_up_to_date(self):
+        self.produce('out.txt')
+        plan = json.loads(self.plan('--plan', 'json'))
+        self.assertEqual([], plan['targets'])
+        self.sleep()
+        self.touch('src.txt')
+        plan = json.loads(self.plan('--plan', 'json'))
+        self.assertEqual(['mid.txt', 'out.txt'],
+                         [entry['target'] for entry in plan['targets']])
+        self.assertEqual('its direct dependency src.txt is newer',
+                         plan['targets'][0]['reason'])
+        self.assertEqual('its direct dependency mid.txt was updated',
+                         plan['targets'][1]['reason'])
+
+    def test_tsv_with_estimates(self):
+        self.produce('check')
+        os.remove('other.txt')
+        lines = self.plan('--plan', 'tsv', 'check').splitlines()
+        self.assertEqual('target\trule\tjobs\testimate\treason', lines[0])
+        self.assertEqual(['other.txt', 'out.txt', 'check'],
+                         [line.split('\t')[0] for line in lines[1:]])
+        for line in lines[1:]:
+            self.assertRegex(line.split('\t')[3], r'^\d+\.\d{3}$')
+
+    def test_cycle(self):
+        with self.assertRaises(produce.ProduceError) as cm:
+            self.plan('--plan', 'json', 'loop1')
+        self.assertIn('cyclic dependency', str(cm.exception))
@@ -0,0 +1,40 @@
+import prodtest
+import produce
+
+class PlanningProcessesTest(prodtest.ProduceTestCase):
+
+    """
+    Tests instantiating rules in advance in planning processes.
+    """
+
+    def test_same_rules(self):
+        serial = produce.Session()
+        serial.plan()
+        parallel = produce.Session()
+        parallel.plan(planning_processes=2)
+        self.assertEqual(set(serial.irules), set(parallel.irules))
+        for target, irule in serial.irules.items():
+            other = parallel.irules[target]
+            self.assertEqual(irule.pos, other.pos)
+            self.assertEqual(irule.avdict, other.avdict)
+            self.assertEqual(irule.recipe(), other.recipe())
+
+    def test_produce(self):
+        self.produce(**{'--planning-processes': '2', '-j': '2'})
+        self.assertFileContents('out/3.txt', 'hi 9 hello 3\n')
+        self.assertFileContents('copy.txt', 'source\n')
+
+    def test_single_process(self):
+        session = produce.Session(cache_irules=False)
+        targets, production = session.create_production(
+            [], planning_processes=1)
+        production.produce(targets)
+        self.assertFileContents('out/3.txt', 'hi 9 hello 3\n')
+        # Rules instantiated in advance are dropped once they are used:
+        self.assertEqual(production.irules, {})
+        # Rules instantiated later are not kept either:
+        targets, production = session.create_production(
+            ['listed.txt'], planning_processes=1)
+        production.produce(targets)
+        self.assertFileExists('extra.txt')
+        self.assertEqual(production.irules, {})
@@ -0,0 +1,45 @@
+import prodtest
+import produce
+
+class PoolsTest(prodtest.ProduceTestCase):
+
+    """
+    Tests that recipes using a pool do not use more than its capacity
+    together, while recipes not using it run alongside them.
+    """
+
+    def test_pools(self):
+        with self.assertLogs() as logs:
+            with self.assertTakesMoreThan(0.8):
+                with self.assertTakesLessThan(1.1):
+                    self.produce('all', **{'-j': '4'})
+        reports = [r.getMessage() for r in logs.records
+                   if r.getMessage().startswith('pool ')]
+        self.assertEqual(len(reports), 2)
+        self.assertTrue(reports[0].startswith(
+            'pool db: 2 recipes, at most 1 of 1 units in use'))
+        self.assertTrue(reports[1].startswith(
+            'pool ssd: 2 recipes, at most 2 of 2 units in use'))
+
+    def test_capacity(self):
+        self.produce('greedy')
+
+    def test_unknown_pool(self):
+        with self.assertRaisesRegex(produce.ProduceError, 'unknown pool nfs'):
+            self.produce('unknown')
+
+    def test_invalid_units(self):
+        with self.assertRaisesRegex(produce.ProduceError,
+                                    'pool.ssd must be a number of units'):
+            self.produce('superscript')
+        with self.assertRaisesRegex(produce.ProduceError,
+                                    'pool.db must be a positive number'):
+            produce.read_pools({'pool.db': '²'})
+
+    def test_pool_is_not_a_variable(self):
+        self.produce('dump-orders')
+        self.assertFileContents('dump.log', 'dumping database orders\n')
+
+    def test_pool_in_included_file(self):
+        self.produce('local/train')
+        self.assertFileContents('local.log', 'train\n')
@@ -0,0 +1,46 @@
+import os
+import prodtest
+import produce
+
+class PretendRecordTest(prodtest.ProduceTestCase):
+
+    """
+    Tests that targets skipped because of --pretend-up-to-date are recorded
+    and rebuilt by the next normal run, even if their modification times no
+    longer show that they are out of date.
+    """
+
+    def test_pretend_record(self):
+        normal = lambda: self.produce('a')
+        pretending = lambda: self.produce('a', **{'-u': 'b'})
+        dry_pretending = lambda: self.produce('a', **{'-u': 'b', '-n': None})
+        self.assertUpdates((), normal, ('a', 'b', 'c', 'd'), ())
+        self.assertFalse(os.path.exists('.produce/pretend'))
+        # A dry run does not record anything:
+        self.assertUpdates(('c',), dry_pretending, (),
+                           ('a', 'b', 'c', 'd'))
+        self.assertFalse(os.path.exists('.produce/pretend'))
+        self.assertUpdates((), pretending, (), ('a', 'b', 'c', 'd'))
+        self.assertTrue(os.path.exists('.produce/pretend'))
+        # b now looks newer than c, but is still rebuilt:
+        self.assertUpdates(('b',), normal, ('a', 'b'), ('c', 'd'))
+        # Once b has been built, it is up to date again:
+        self.assertUpdates((), normal, (), ('a', 'b', 'c', 'd'))
+
+    def test_compaction(self):
+        record = produce.PretendRecord('.produce/pretend')
+        for i in range(300):
+            record.add('a')
+            record.discard('a')
+        record.add('b')
+        record.close()
+        with open('.produce/pretend', 'a') as f:
+            f.write('+c') # truncated
+        record = produce.PretendRecord('.produce/pretend')
+        self.assertIn('b', record)
+        self.assertNotIn('a', record)
+        self.assertNotIn('c', record)
+        self.assertFileContents('.produce/pretend', '+b\n')
+        record.add('d')
+        record.close()
+        self.assertFileContents('.produce/pretend', '+b\n+d\n')
@@ -0,0 +1,46 @@
+import io
+import prodtest
+import produce
+
+class ProgressTest(prodtest.ProduceTestCase):
+
+    """
+    Tests the progress display and the duration history it uses.
+    """
+
+    def test_display(self):
+        history = produce.DurationHistory('.produce/durations')
+        stream = io.StringIO()
+        display = produce.ProgressDisplay(2, history, stream, interval=0)
+        handlers = produce.status_logger.handlers
+        produce.status_logger.handlers = [display]
+        try:
+            display.queue('a')
+            display.queue('b')
+            self.assertIn('done 0  running 0  queued 2  failed 0',
+                          stream.getvalue())
+            produce.status_info('running task', 'a', 0)
+            produce.status_info('running task', 'b', 0)
+            self.assertIn('done 0  running 2  queued 0  failed 0',
+                          stream.getvalue())
+            produce.status_info('complete', 'a', 0)
+            self.assertIn('done 1  running 1  queued 0  failed 0',
+                          stream.getvalue())
+            self.assertIn('ETA 0:00:00', stream.getvalue())
+            produce.status_error('incomplete', 'b', 0)
+            self.assertIn('incomplete', stream.getvalue())
+            self.assertIn('done 1  running 0  queued 0  failed 1',
+                          stream.getvalue())
+        finally:
+            produce.status_logger.handlers = handlers
+            display.finish()
+        self.assertTrue(stream.getvalue().endswith(
+            '1 recipes completed, 1 failed in 0:00:00\n'))
+
+    def test_history(self):
+        self.produce()
+        self.assertDirectoryContents(['durations'], '.produce')
+        history = produce.DurationHistory('.produce/durations')
+        self.assertLess(history.get('a'), 1)
+        self.assertLess(history.get('b'), 1)
+        self.assertIsNone(history.get('c'))
@@ -0,0 +1,43 @@
+import prodtest
+import produce
+
+class QuestionTest(prodtest.ProduceTestCase):
+
+    """
+    Tests that -q/--question tells whether anything is out of date, without
+    running recipes and without looking further than necessary.
+    """
+
+    def question(self, *targets):
+        return produce.produce(['-q'] + list(targets))
+
+    def test_question(self):
+        self.assertEqual(self.question('a.txt'), 1)
+        self.assertState((), ('a.txt', 'b.txt', 'c.txt'))
+        self.produce('a.txt')
+        self.assertEqual(self.question('a.txt'), 0)
+        self.sleep()
+        self.touch('c.txt')
+        mtime = self.mtime('a.txt')
+        self.assertEqual(self.question('a.txt'), 1)
+        self.assertEqual(self.mtime('a.txt'), mtime)
+
+    def test_eager(self):
+        self.produce('a.txt')
+        self.sleep()
+        self.touch('c.txt')
+        session = produce.Session()
+        entry = session.question(['a.txt'])
+        self.assertEqual(entry.target, 'b.txt')
+        self.assertEqual(entry.reason, 'its direct dependency c.txt is newer')
+        # A missing target is found before its dependencies are looked at:
+        self.assertEqual(self.question('d.txt'), 1)
+        self.assertEqual(self.question('a.txt', 'd.txt'), 1)
+
+    def test_error(self):
+        self.touch('d.txt')
+        self.assertEqual(self.question('d.txt'), 2)
+
+    def test_not_with_plan(self):
+        with self.assertRaises(SystemExit):
+            produce.produce(['-q', '--plan', 'json', 'a.txt'])
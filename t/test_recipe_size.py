@@ -0,0 +1,15 @@
+import prodtest
+
+class RecipeSizeTest(prodtest.ProduceTestCase):
+
+    """
+    Tests that short shell recipes, which are handed to the shell through a
+    pipe, and long ones and ones for other interpreters, which go through a
+    temporary file, all work.
+    """
+
+    def test_recipe_size(self):
+        self.produce('short.txt', 'long.txt', 'python.txt')
+        self.assertFileContents('short.txt', 'short\n')
+        self.assertFileContents('long.txt', 'long\n')
+        self.assertFileContents('python.txt', 'python True\n')
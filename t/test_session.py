@@ -0,0 +1,46 @@
+import prodtest
+import produce
+
+class SessionTest(prodtest.ProduceTestCase):
+
+    """
+    Tests producing targets repeatedly through a Session.
+    """
+
+    def test_results(self):
+        session = produce.Session()
+        results = session.produce()
+        self.assertEqual(['in.txt', 'out.txt'], list(results))
+        self.assertFalse(results['in.txt'].updated)
+        self.assertIsNone(results['in.txt'].duration)
+        self.assertTrue(results['out.txt'].updated)
+        self.assertLess(results['out.txt'].duration, 1)
+        self.assertEqual(self.mtime('out.txt'), results['out.txt'].mtime)
+        results = session.produce(['out.txt'])
+        self.assertFalse(results['out.txt'].updated)
+        self.assertIn('out.txt', session.irules)
+        self.assertNotIn('in.txt', session.irules)
+
+    def test_invalidate(self):
+        session = produce.Session()
+        session.produce()
+        self.sleep()
+        self.createFile('in.txt', 'two\n')
+        # The session does not know about the change until told:
+        self.assertFalse(session.produce()['out.txt'].updated)
+        session.invalidate(['in.txt'])
+        self.assertTrue(session.produce()['out.txt'].updated)
+        self.assertFileContents('out.txt', 'two\n')
+
+    def test_failure(self):
+        session = produce.Session()
+        with self.assertRaises(produce.ProduceError) as cm:
+            session.produce(['fail'])
+        self.assertEqual(['in.txt', 'out.txt'], list(cm.exception.results))
+
+    def test_dry_run(self):
+        session = produce.Session()
+        results = session.produce(dry_run=True)
+        self.assertTrue(results['out.txt'].updated)
+        self.assertIsNone(results['out.txt'].duration)
+        self.assertDirectoryContents(['produce.ini', 'in.txt'])
@@ -0,0 +1,52 @@
+import os
+import prodtest
+import produce
+
+class TraversalTest(prodtest.ProduceTestCase):
+
+    """
+    Tests that the dependency graph is traversed without recursion, that
+    targets claimed as outputs are not produced twice, that cycles are found
+    even when they go through a depfile, that errors in the graph do not kill
+    running recipes, and that with one job, targets are produced one after
+    the other.
+    """
+
+    def test_deep_chain(self):
+        with self.assertLogs('produce') as logs:
+            self.produce('chain0')
+        self.assertFileExists('chain5000')
+        depths = [r.msg.depth for r in logs.records
+                  if r.msg.target == 'chain5000']
+        self.assertEqual(depths, [5000, 5000])
+
+    def test_claimed_output(self):
+        self.produce('ab', **{'-j': '2'})
+        self.assertFileContents('b.txt', '')
+
+    def test_cycle_through_depfile(self):
+        with self.assertRaisesRegex(produce.ProduceError,
+                                    r'cyclic dependency: z.txt <- x.txt <- '
+                                    r'z.txt'):
+            self.produce('z.txt')
+        self.assertFileExists('x.d')
+        self.assertFileDoesNotExist('x.txt')
+
+    def test_error_lets_running_recipe_finish(self):
+        for jobs in ('1', '2'):
+            with self.subTest(jobs=jobs):
+                with self.assertLogs('produce') as logs:
+                    with self.assertRaisesRegex(produce.ProduceError,
+                                                'no rule to produce '
+                                                'missing.txt'):
+                        self.produce('broken', **{'-j': jobs})
+                self.assertFileContents('slow.txt', 'slow\n')
+                self.assertIn(('complete', 'slow.txt'),
+                              [(r.msg.action, r.msg.target)
+                               for r in logs.records])
+                os.remove('slow.txt')
+
+    def test_one_job_in_order(self):
+        self.produce('download_and_models')
+        self.assertFileExists('out/x.model')
+        self.assertFileExists('out/y.model')